@@ -19,12 +19,18 @@
 # You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
 # <https://www.gnu.org/licenses/>.
 #
+from contextlib import nullcontext
+from functools import lru_cache
+
+from django.conf import settings
 from django.http import (
     HttpResponseForbidden, HttpResponseNotFound, HttpResponseServerError,
 )
 from django.middleware.csrf import REASON_NO_CSRF_COOKIE, REASON_NO_REFERER
-from django.template import TemplateDoesNotExist, loader
+from django.template import TemplateDoesNotExist
 from django.template.loader import get_template
+from django.urls import Resolver404
+from django.utils import translation
 from django.utils.functional import Promise
 from django.utils.translation import gettext as _
 from django.views.decorators.csrf import requires_csrf_token
@@ -33,17 +39,40 @@ from sentry_sdk import last_event_id
 from pretix.base.i18n import language
 from pretix.base.middleware import get_language_from_request
 
+_FALLBACK_500 = b'<h1>Server Error (500)</h1>'
 
-def csrf_failure(request, reason=""):
+
+class _NotFoundResponse(HttpResponseNotFound):
+    # Error pages may be shown inside the widget iframe
+    xframe_options_exempt = True
+
+
+class _ServerErrorResponse(HttpResponseServerError):
+    xframe_options_exempt = True
+
+
+def _get_locale(request):
     try:
-        locale = get_language_from_request(request)
-    except:
-        locale = "en"
-    with language(locale):  # Middleware might not have run, need to do this manually
-        t = get_template('csrffail.html')
-        c = {
-            'reason': reason,
-            'no_referer': reason == REASON_NO_REFERER,
+        return get_language_from_request(request)
+    except Exception:
+        # Error pages need to render even if the request is too broken to determine a language
+        return "en"
+
+
+def _language(locale):
+    if translation.get_language() == locale:
+        # The middleware already activated the right language, no need to switch back and forth
+        return nullcontext()
+    return language(locale)
+
+
+@lru_cache(maxsize=256)
+def _cached_csrf_failure_body(locale, no_referer, no_cookie):
+    # The page does not contain anything request-specific, so we only need to render each variant once. The
+    # reason is kept out of the cache key, as it may contain request data (e.g. the Origin header).
+    with language(locale):
+        return get_template('csrffail.html').render({
+            'no_referer': no_referer,
             'no_referer1': _(
                 "You are seeing this message because this HTTPS site requires a "
                 "'Referer header' to be sent by your Web browser, but none was "
@@ -53,7 +82,7 @@ def csrf_failure(request, reason=""):
                 "If you have configured your browser to disable 'Referer' headers, "
                 "please re-enable them, at least for this site, or for HTTPS "
                 "connections, or for 'same-origin' requests."),
-            'no_cookie': reason == REASON_NO_CSRF_COOKIE,
+            'no_cookie': no_cookie,
             'no_cookie1': _(
                 "You are seeing this message because this site requires a CSRF "
                 "cookie when submitting forms. This cookie is required for "
@@ -63,52 +92,60 @@ def csrf_failure(request, reason=""):
                 "If you have configured your browser to disable cookies, please "
                 "re-enable them, at least for this site, or for 'same-origin' "
                 "requests."),
-        }
-        return HttpResponseForbidden(t.render(c), content_type='text/html')
+        }).encode()
+
+
+def _csrf_failure_body(locale, no_referer, no_cookie):
+    if settings.DEBUG:
+        # Keep picking up template changes during development
+        return _cached_csrf_failure_body.__wrapped__(locale, no_referer, no_cookie)
+    return _cached_csrf_failure_body(locale, no_referer, no_cookie)
+
+
+def csrf_failure(request, reason=""):
+    body = _csrf_failure_body(
+        _get_locale(request),
+        no_referer=reason == REASON_NO_REFERER,
+        no_cookie=reason == REASON_NO_CSRF_COOKIE,
+    )
+    return HttpResponseForbidden(body, content_type='text/html')
 
 
 @requires_csrf_token
 def page_not_found(request, exception):
-    try:
-        locale = get_language_from_request(request)
-    except:
-        locale = "en"
-    with language(locale):  # Middleware might not have run, need to do this manually
+    locale = _get_locale(request)
+    with _language(locale):  # Middleware might not have run, need to do this manually
         exception_repr = exception.__class__.__name__
         # Try to get an "interesting" exception message, if any (and not the ugly
-        # Resolver404 dictionary)
-        try:
-            message = exception.args[0]
-        except (AttributeError, IndexError):
-            pass
-        else:
-            if isinstance(message, (str, Promise)):
-                exception_repr = str(message)
+        # Resolver404 dictionary, which is always what we get for unknown URLs)
+        if not isinstance(exception, Resolver404):
+            try:
+                message = exception.args[0]
+            except (AttributeError, IndexError):
+                pass
+            else:
+                if type(message) is str:
+                    exception_repr = message
+                elif isinstance(message, (str, Promise)):
+                    exception_repr = str(message)
         context = {
             'request_path': request.path,
             'exception': exception_repr,
         }
         template = get_template('404.html')
         body = template.render(context, request)
-        r = HttpResponseNotFound(body)
-        r.xframe_options_exempt = True
-        return r
+        return _NotFoundResponse(body)
 
 
 @requires_csrf_token
 def server_error(request):
-    try:
-        locale = get_language_from_request(request)
-    except:
-        locale = "en"
-    with language(locale):  # Middleware might not have run, need to do this manually
+    locale = _get_locale(request)
+    with _language(locale):  # Middleware might not have run, need to do this manually
         try:
-            template = loader.get_template('500.html')
+            template = get_template('500.html')
         except TemplateDoesNotExist:
-            return HttpResponseServerError('<h1>Server Error (500)</h1>', content_type='text/html')
-        r = HttpResponseServerError(template.render({
+            return HttpResponseServerError(_FALLBACK_500, content_type='text/html')
+        return _ServerErrorResponse(template.render({
             'request': request,
             'sentry_event_id': last_event_id(),
         }))
-        r.xframe_options_exempt = True
-        return r
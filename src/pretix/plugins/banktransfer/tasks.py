@@ -42,7 +42,7 @@ from functools import reduce
 import dateutil.parser
 from celery.exceptions import MaxRetriesExceededError
 from django.conf import settings
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import Max, Min, Q
 from django.db.models.functions import Length
 from django.utils.timezone import now
@@ -112,11 +112,11 @@ def _find_order_for_code(base_qs, code):
         code[:settings.ENTROPY['order_code']],
         Order.normalize_code(code[:settings.ENTROPY['order_code']], is_fallback=True)
     ]
+    # Fetch all candidates in one query, but keep preferring them in the order given above
+    orders_by_code = {o.code: o for o in base_qs.filter(code__in=set(try_codes))}
     for c in try_codes:
-        try:
-            return base_qs.get(code=c)
-        except Order.DoesNotExist:
-            pass
+        if c in orders_by_code:
+            return orders_by_code[c]
 
 
 def _find_order_for_invoice_id(base_qs, prefixes, number):
@@ -140,28 +140,25 @@ def _find_order_for_invoice_id(base_qs, prefixes, number):
 @transaction.atomic
 def _handle_transaction(trans: BankTransaction, matches: tuple, regex_match_to_slug, event: Event = None, organizer: Organizer = None):
     orders = []
+    seen_codes = set()
     if event:
         for slug, code in matches:
             order = _find_order_for_code(event.orders, code)
-            if order:
-                if order.code not in {o.code for o in orders}:
-                    orders.append(order)
-            else:
+            if not order:
                 order = _find_order_for_invoice_id(Invoice.objects.filter(event=event), (slug, regex_match_to_slug.get(slug, slug)), code)
-                if order and order.code not in {o.code for o in orders}:
-                    orders.append(order)
+            if order and order.code not in seen_codes:
+                seen_codes.add(order.code)
+                orders.append(order)
     else:
         qs = Order.objects.filter(event__organizer=organizer)
         for slug, code in matches:
             original_slug = regex_match_to_slug.get(slug, slug)
             order = _find_order_for_code(qs.filter(Q(event__slug__iexact=slug) | Q(event__slug__iexact=original_slug)), code)
-            if order:
-                if order.code not in {o.code for o in orders}:
-                    orders.append(order)
-            else:
+            if not order:
                 order = _find_order_for_invoice_id(Invoice.objects.filter(event__organizer=organizer), (slug, original_slug), code)
-                if order and order.code not in {o.code for o in orders}:
-                    orders.append(order)
+            if order and order.code not in seen_codes:
+                seen_codes.add(order.code)
+                orders.append(order)
 
     if not orders:
         # No match
@@ -321,7 +318,10 @@ def _get_unknown_transactions(job: BankImportJob, data: list, event: Event = Non
         Q(event=event) if event else Q(organizer=organizer), external_id__isnull=False
     ).values('external_id', 'date', 'amount'))
 
+    region = (event and event.settings.region) or (organizer and organizer.settings.region) or None
+
     transactions = []
+    new_transactions = []
     for row in data:
         amount = row['amount']
         if not isinstance(amount, Decimal):
@@ -348,17 +348,33 @@ def _get_unknown_transactions(job: BankImportJob, data: list, event: Event = Non
                                 external_id=row.get('external_id'),
                                 currency=event.currency if event else job.currency)
 
-        trans.date_parsed = parse_date(trans.date, (event and event.settings.region) or (organizer and organizer.settings.region) or None)
+        trans.date_parsed = parse_date(trans.date, region)
 
         trans.checksum = trans.calculate_checksum()
         if trans.checksum not in known_checksums and (not trans.external_id or (trans.external_id, trans.date, trans.amount) not in known_by_external_id):
-            trans.state = BankTransaction.STATE_UNCHECKED
+            if trans.amount == Decimal("0.00"):
+                # Ignore all zero-valued transactions
+                trans.state = BankTransaction.STATE_DISCARDED
+            else:
+                trans.state = BankTransaction.STATE_UNCHECKED
+                transactions.append(trans)
+            new_transactions.append(trans)
+
+    # Matching needs the primary keys of the new transactions, which bulk_create() only sets if the database can
+    # return rows from bulk inserts (e.g. not on SQLite < 3.35)
+    if connection.features.can_return_rows_from_bulk_insert:
+        BankTransaction.objects.bulk_create(new_transactions, batch_size=500)
+    else:
+        for trans in new_transactions:
             trans.save()
-            transactions.append(trans)
-
     return transactions
 
 
+def _mark_nomatch(pks):
+    if pks:
+        BankTransaction.objects.filter(pk__in=pks).update(state=BankTransaction.STATE_NOMATCH)
+
+
 @app.task(base=TransactionAwareTask, bind=True, max_retries=5, default_retry_delay=1)
 def process_banktransfers(self, job: int, data: list) -> None:
     with language("en"):  # We'll translate error messages at display time
@@ -368,6 +384,9 @@ def process_banktransfers(self, job: int, data: list) -> None:
             job.state = BankImportJob.STATE_RUNNING
             job.save()
 
+            # Transactions without any reference match are marked with batched UPDATEs instead of one UPDATE per
+            # transaction.
+            nomatch_ids = []
             try:
                 # Delete left-over transactions from a failed run before so they can reimported
                 BankTransaction.objects.filter(state=BankTransaction.STATE_UNCHECKED, **job.owner_kwargs).delete()
@@ -419,22 +438,17 @@ def process_banktransfers(self, job: int, data: list) -> None:
                 )
 
                 for trans in transactions:
-                    if trans.amount == Decimal("0.00"):
-                        # Ignore all zero-valued transactions
-                        trans.state = BankTransaction.STATE_DISCARDED
-                        trans.save()
-                        continue
                     # Whitespace in references is unreliable since linebreaks and spaces can occur almost anywhere, e.g.
                     # DEMOCON-123\n45 should be matched to DEMOCON-12345. However, sometimes whitespace is important,
                     # e.g. when there are two references. "DEMOCON-12345 DEMOCON-45678" would otherwise be parsed as
                     # "DEMOCON-12345DE" in some conditions. We'll naively take whatever has more matches.
-                    matches_with_whitespace = pattern.findall(trans.reference.replace("\n", " ").upper())
-                    matches_without_whitespace = pattern.findall(trans.reference.replace(" ", "").replace("\n", "").upper())
-
-                    if len(matches_without_whitespace) > len(matches_with_whitespace):
-                        matches = matches_without_whitespace
-                    else:
-                        matches = matches_with_whitespace
+                    reference = trans.reference.replace("\n", " ").upper()
+                    matches = pattern.findall(reference)
+                    if " " in reference:
+                        # Without any whitespace, both variants are identical and a second pass is pointless.
+                        matches_without_whitespace = pattern.findall(reference.replace(" ", ""))
+                        if len(matches_without_whitespace) > len(matches):
+                            matches = matches_without_whitespace
 
                     if matches:
                         if job.event:
@@ -443,7 +457,12 @@ def process_banktransfers(self, job: int, data: list) -> None:
                             _handle_transaction(trans, matches, regex_match_to_slug, organizer=job.organizer)
                     else:
                         trans.state = BankTransaction.STATE_NOMATCH
-                        trans.save()
+                        nomatch_ids.append(trans.pk)
+                        if len(nomatch_ids) >= 500:
+                            _mark_nomatch(nomatch_ids)
+                            nomatch_ids = []
+                _mark_nomatch(nomatch_ids)
+                nomatch_ids = []
             except LockTimeoutException:
                 try:
                     self.retry()
@@ -458,3 +477,7 @@ def process_banktransfers(self, job: int, data: list) -> None:
             else:
                 job.state = BankImportJob.STATE_COMPLETED
                 job.save()
+            finally:
+                # If a later transaction failed, still store the ones we already know to be unmatched. Otherwise,
+                # they would be deleted as left-overs by the next run instead of being shown for manual resolution.
+                _mark_nomatch(nomatch_ids)
@@ -325,15 +325,15 @@ class JobDetailView(DetailView):
     def get_context_data(self, **kwargs):
         ctx = {}
 
-        qs = self.job.transactions.select_related('order', 'order__event')
-
-        ctx['transactions_valid'] = qs.filter(state=BankTransaction.STATE_VALID).count()
-        ctx['transactions_invalid'] = qs.filter(state__in=[
-            BankTransaction.STATE_INVALID, BankTransaction.STATE_ERROR
-        ]).count()
-        ctx['transactions_ignored'] = qs.filter(state__in=[
-            BankTransaction.STATE_DUPLICATE, BankTransaction.STATE_NOMATCH
-        ]).count()
+        ctx.update(self.job.transactions.aggregate(
+            transactions_valid=Count('pk', filter=Q(state=BankTransaction.STATE_VALID)),
+            transactions_invalid=Count('pk', filter=Q(state__in=[
+                BankTransaction.STATE_INVALID, BankTransaction.STATE_ERROR
+            ])),
+            transactions_ignored=Count('pk', filter=Q(state__in=[
+                BankTransaction.STATE_DUPLICATE, BankTransaction.STATE_NOMATCH
+            ])),
+        ))
         ctx['job'] = self.job
         ctx['organizer'] = self.request.organizer
 
@@ -387,7 +387,7 @@ class ImportView(ListView):
             qs = BankTransaction.objects.filter(
                 Q(organizer=self.request.organizer)
             )
-        qs = qs.select_related('order').filter(state__in=[
+        qs = qs.select_related('order', 'order__event').filter(state__in=[
             BankTransaction.STATE_INVALID, BankTransaction.STATE_ERROR,
             BankTransaction.STATE_DUPLICATE, BankTransaction.STATE_NOMATCH
         ])
@@ -470,9 +470,8 @@ class ImportView(ListView):
             messages.error(self.request, _('I\'m sorry, but we detected this file as empty. Please '
                                            'contact support for help.'))
 
-        if o.settings.get(self._hint_settings_name(self.request.POST.get('currency'))) is not None:
-            hint = o.settings.get(self._hint_settings_name(self.request.POST.get('currency')), as_type=dict)
-
+        hint = o.settings.get(self._hint_settings_name(self.request.POST.get('currency')), as_type=dict)
+        if hint is not None:
             try:
                 parsed, good = csvimport.parse(data, hint)
             except csvimport.HintMismatchError:  # TODO: narrow down
@@ -0,0 +1,139 @@
+#
+# This file is part of pretix (Community Edition).
+#
+# Copyright (C) 2014-2020  Raphael Michel and contributors
+# Copyright (C) 2020-today pretix GmbH and contributors
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General
+# Public License as published by the Free Software Foundation in version 3 of the License.
+#
+# ADDITIONAL TERMS APPLY: Pursuant to Section 7 of the GNU Affero General Public License, additional terms are
+# applicable granting you additional permissions and placing additional restrictions on your usage of this software.
+# Please refer to the pretix LICENSE file to obtain the full terms applicable to this work. If you did not receive
+# this file, see <https://pretix.eu/about/en/license>.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied
+# warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Affero General Public License along with this program.  If not, see
+# <https://www.gnu.org/licenses/>.
+#
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.middleware.csrf import REASON_NO_CSRF_COOKIE, REASON_NO_REFERER
+from django.test import RequestFactory
+from django.urls import Resolver404
+from django.utils import translation
+from django.utils.translation import gettext_lazy
+
+from pretix.base.i18n import language
+from pretix.base.views.errors import (
+    _cached_csrf_failure_body, csrf_failure, page_not_found, server_error,
+)
+
+
+@pytest.fixture
+def rf_request():
+    r = RequestFactory().get('/foo/bar')
+    r.user = AnonymousUser()
+    return r
+
+
+@pytest.mark.django_db
+def test_404_resolver_hides_details(rf_request):
+    r = page_not_found(rf_request, Resolver404({'path': 'foo/bar', 'tried': []}))
+    assert r.status_code == 404
+    assert r.xframe_options_exempt
+    assert b'Resolver404' in r.content
+    assert b'tried' not in r.content
+
+
+@pytest.mark.django_db
+def test_404_shows_message(rf_request):
+    r = page_not_found(rf_request, Http404('Unknown ticket'))
+    assert r.status_code == 404
+    assert b'Unknown ticket' in r.content
+
+
+@pytest.mark.django_db
+def test_404_shows_lazy_message(rf_request):
+    r = page_not_found(rf_request, Http404(gettext_lazy('Unknown ticket')))
+    assert r.status_code == 404
+    assert b'Unknown ticket' in r.content
+
+
+@pytest.mark.django_db
+def test_404_without_message(rf_request):
+    r = page_not_found(rf_request, Http404())
+    assert r.status_code == 404
+    assert b'Http404' in r.content
+
+
+@pytest.mark.django_db
+def test_500(rf_request):
+    r = server_error(rf_request)
+    assert r.status_code == 500
+    assert r.xframe_options_exempt
+    assert b'Internal Server Error' in r.content
+
+
+@pytest.mark.django_db
+def test_500_without_template(rf_request, settings):
+    settings.TEMPLATES = [{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'OPTIONS': {
+            'loaders': [('django.template.loaders.locmem.Loader', {})],
+        },
+    }]
+    r = server_error(rf_request)
+    assert r.status_code == 500
+    assert r.content == b'<h1>Server Error (500)</h1>'
+    assert not getattr(r, 'xframe_options_exempt', False)
+
+
+@pytest.mark.django_db
+def test_500_keeps_active_language(rf_request, monkeypatch):
+    def fail(locale):
+        raise AssertionError('language should not be switched')
+
+    monkeypatch.setattr('pretix.base.views.errors.language', fail)
+    with translation.override('en'):
+        r = server_error(rf_request)
+    assert r.status_code == 500
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('reason,text', [
+    (REASON_NO_REFERER, b'Referer header'),
+    (REASON_NO_CSRF_COOKIE, b'requires a CSRF cookie'),
+    ('Origin checking failed - https://evil.example does not match any trusted origins.', b'Please go back'),
+])
+def test_csrf_failure(rf_request, reason, text):
+    for i in range(2):
+        r = csrf_failure(rf_request, reason=reason)
+        assert r.status_code == 403
+        assert text in r.content
+        assert b'evil.example' not in r.content
+
+
+@pytest.fixture
+def clear_csrf_failure_cache():
+    _cached_csrf_failure_body.cache_clear()
+    yield
+    _cached_csrf_failure_body.cache_clear()
+
+
+def test_csrf_failure_body_renders_in_its_language(monkeypatch, clear_csrf_failure_cache):
+    languages = []
+
+    class RecordingTemplate:
+        def render(self, context):
+            languages.append(translation.get_language())
+            return ''
+
+    monkeypatch.setattr('pretix.base.views.errors.get_template', lambda name: RecordingTemplate())
+    with language('en'):
+        _cached_csrf_failure_body('de', False, True)
+    assert languages == ['de']
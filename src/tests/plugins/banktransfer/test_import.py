@@ -39,6 +39,7 @@ import pytest
 from bs4 import BeautifulSoup
 from django.core import mail as djmail
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.utils.timezone import now
 from django_scopes import scopes_disabled
 
@@ -164,6 +165,29 @@ def test_mark_paid(env, job):
     assert djmail.outbox[0].subject == 'Payment received for your order: 1Z3AS'
 
 
+@pytest.mark.django_db
+def test_mark_paid_without_bulk_insert_returning(env, job, monkeypatch):
+    monkeypatch.setattr(type(connection.features), 'can_return_rows_from_bulk_insert', False)
+    process_banktransfers(job, [{
+        'payer': 'Karla Kundin',
+        'reference': 'Bestellung DUMMY1234S',
+        'date': '2016-01-26',
+        'amount': '23.00'
+    }, {
+        'payer': 'Karla Kundin',
+        'reference': 'No useful reference',
+        'date': '2016-01-26',
+        'amount': '23.00'
+    }])
+    env[2].refresh_from_db()
+    assert env[2].status == Order.STATUS_PAID
+    with scopes_disabled():
+        job = BankImportJob.objects.last()
+        assert job.transactions.count() == 2
+        assert job.transactions.get(reference='Bestellung DUMMY1234S').state == BankTransaction.STATE_VALID
+        assert job.transactions.get(reference='No useful reference').state == BankTransaction.STATE_NOMATCH
+
+
 @pytest.mark.django_db
 def test_underpaid(env, job):
     djmail.outbox = []
@@ -457,6 +481,62 @@ def test_keep_unmatched(env, orga_job):
         assert t.state == BankTransaction.STATE_NOMATCH
 
 
+@pytest.mark.django_db
+def test_keep_unmatched_many(env, orga_job):
+    # More rows than fit into a single state update batch
+    process_banktransfers(orga_job, [{
+        'payer': 'Karla Kundin',
+        'reference': 'No useful reference %d' % i,
+        'date': '2016-01-26',
+        'amount': '23.00'
+    } for i in range(501)])
+    with scopes_disabled():
+        job = BankImportJob.objects.last()
+        assert job.transactions.count() == 501
+        assert not job.transactions.exclude(state=BankTransaction.STATE_NOMATCH).exists()
+
+
+@pytest.mark.django_db
+def test_keep_unmatched_on_failure(env, job, monkeypatch):
+    def fail(*args, **kwargs):
+        raise ValueError('Matching failed')
+
+    monkeypatch.setattr('pretix.plugins.banktransfer.tasks._handle_transaction', fail)
+    with pytest.raises(ValueError):
+        process_banktransfers(job, [{
+            'payer': 'Karla Kundin',
+            'reference': 'No useful reference',
+            'date': '2016-01-26',
+            'amount': '23.00'
+        }, {
+            'payer': 'Karla Kundin',
+            'reference': 'Bestellung DUMMY1234S',
+            'date': '2016-01-26',
+            'amount': '23.00'
+        }])
+    with scopes_disabled():
+        job = BankImportJob.objects.last()
+        assert job.state == BankImportJob.STATE_ERROR
+        t = job.transactions.get(reference='No useful reference')
+        assert t.state == BankTransaction.STATE_NOMATCH
+
+
+@pytest.mark.django_db
+def test_discard_zero_amount(env, job):
+    process_banktransfers(job, [{
+        'payer': 'Karla Kundin',
+        'reference': 'Bestellung DUMMY1234S',
+        'date': '2016-01-26',
+        'amount': '0.00'
+    }])
+    env[2].refresh_from_db()
+    assert env[2].status == Order.STATUS_PENDING
+    with scopes_disabled():
+        job = BankImportJob.objects.last()
+        t = job.transactions.last()
+        assert t.state == BankTransaction.STATE_DISCARDED
+
+
 @pytest.mark.django_db
 def test_split_payment_success(env, orga_job):
     with scopes_disabled():